@@ -0,0 +1,186 @@
+import re
+from dataclasses import dataclass
+from typing import ClassVar
+
+@dataclass
+class GenerateIntent:
+    intent: ClassVar[str] = "generate"
+    subreddit: str
+    topic: str
+
+@dataclass
+class PostGeneratedIntent:
+    intent: ClassVar[str] = "post_generated"
+    subreddit: str
+    title: str
+    text: str
+
+@dataclass
+class WatchIntent:
+    intent: ClassVar[str] = "watch"
+    subreddit: str
+    topic: str | None = None
+    delay: float | None = None
+
+@dataclass
+class UnwatchIntent:
+    intent: ClassVar[str] = "unwatch"
+    subreddit: str
+    topic: str | None = None
+
+@dataclass
+class SearchIntent:
+    intent: ClassVar[str] = "search"
+    topic: str
+    subreddits: str = "all"
+    limit: int = 5
+    with_comments: bool = False
+
+@dataclass
+class ReplyIntent:
+    intent: ClassVar[str] = "reply"
+    reply_text: str
+    post_id: str | None = None
+
+@dataclass
+class ScheduleIntent:
+    intent: ClassVar[str] = "schedule"
+    delay: float
+    subreddit: str | None = None
+    topic: str | None = None
+
+@dataclass
+class PostIntent:
+    intent: ClassVar[str] = "post"
+    subreddits: str
+    post_type: str
+    title: str
+    text: str | None = None
+    url: str | None = None
+    poll_options: list | None = None
+    poll_duration: int | None = None
+
+@dataclass
+class UnknownIntent:
+    intent: ClassVar[str] = "unknown"
+    message: str
+
+FLAGS = re.IGNORECASE | re.DOTALL
+SUBREDDIT = r"(?:r/)?(?P<subreddit>[\w+]+)"
+DELAY = r"(?P<delay>\d+(?:\.\d+)?)(?:\s+minutes?)?"
+
+# Leading command keyword, matched once per prompt and used to pick the body grammar from DISPATCH
+KEYWORD_RE = re.compile(
+    r"\s*(?P<keyword>generate post for|post generated for|schedule generated post for|schedule posts every"
+    r"|reply to post|reply to all with|search for|unwatch|watch|post to)\s+",
+    FLAGS
+)
+
+GENERATE_RE = re.compile(SUBREDDIT + r"\s+about\s+(?P<topic>.+?)\s*", FLAGS)
+TITLE_TEXT_RE = re.compile(SUBREDDIT + r"\s+with title\s+(?P<title>.+?)\s+text:\s*(?P<text>.+?)\s*", FLAGS)
+WATCH_RE = re.compile(r"(?:(?P<topic>.+)\s+in\s+)?" + SUBREDDIT + r"(?:\s+every\s+" + DELAY + r")?\s*", FLAGS)
+UNWATCH_RE = re.compile(r"(?:(?P<topic>.+)\s+in\s+)?" + SUBREDDIT + r"\s*", FLAGS)
+SEARCH_RE = re.compile(r"(?P<topic>.+?)\s*", FLAGS)
+# Trailing search clauses, peeled off the end of the topic in any order
+SEARCH_CLAUSE_RE = re.compile(
+    r"\s+(?:in\s+(?:r/)?(?P<subreddits>[\w+]+)|limit\s+(?P<limit>\d+)|(?P<with_comments>with comments))\s*$", FLAGS
+)
+# A clause keyword still ending the topic after peeling means that clause failed to parse
+DANGLING_SEARCH_CLAUSE_RE = re.compile(
+    r"\s+(?:(?P<subreddits>in)\s+\S+|(?P<limit>limit)\s+\S+|(?P<with_comments>with comments))\s*$", FLAGS
+)
+REPLY_POST_RE = re.compile(r"(?P<post_id>\w+)\s+with\s+(?P<reply_text>.+?)\s*", FLAGS)
+REPLY_ALL_RE = re.compile(r"(?P<reply_text>.+?)\s*", FLAGS)
+SCHEDULE_GENERATED_RE = re.compile(SUBREDDIT + r"\s+about\s+(?P<topic>.+?)\s+every\s+" + DELAY + r"\s*", FLAGS)
+SCHEDULE_POSTS_RE = re.compile(DELAY + r"\s*", FLAGS)
+POLL_RE = re.compile(
+    SUBREDDIT + r"\s+with(?:\s+poll)?\s+title\s+(?P<title>.+?)\s+options\s+(?P<options>.+?)\s+duration\s+(?P<duration>\d+)\s*",
+    FLAGS
+)
+
+def parse_generate(match):
+    return GenerateIntent(subreddit=match["subreddit"].lower(), topic=match["topic"])
+
+def parse_post_generated(match):
+    return PostGeneratedIntent(subreddit=match["subreddit"].lower(), title=match["title"], text=match["text"])
+
+def parse_watch(match):
+    return WatchIntent(
+        subreddit=match["subreddit"].lower(),
+        topic=match["topic"],
+        delay=float(match["delay"]) if match["delay"] else None
+    )
+
+def parse_unwatch(match):
+    return UnwatchIntent(subreddit=match["subreddit"].lower(), topic=match["topic"])
+
+def parse_search(match):
+    topic = match["topic"]
+    clauses = {}
+    while True:
+        clause = SEARCH_CLAUSE_RE.search(topic)
+        # Each clause is taken once; a repeat (e.g. "tools in 2025 in startups") belongs to the topic
+        if not clause or clause.lastgroup in clauses:
+            break
+        clauses[clause.lastgroup] = clause[clause.lastgroup]
+        topic = topic[:clause.start()]
+    dangling = DANGLING_SEARCH_CLAUSE_RE.search(topic)
+    # "limit <word>" followed by a valid clause reads as topic text ("speed limit cameras in technology")
+    if dangling and dangling.lastgroup not in clauses and (dangling.lastgroup != "limit" or not clauses):
+        return UnknownIntent(message="Invalid search format")
+    return SearchIntent(
+        topic=topic,
+        subreddits=clauses.get("subreddits", "all").lower(),
+        limit=int(clauses.get("limit", 5)),
+        with_comments="with_comments" in clauses
+    )
+
+def parse_reply_post(match):
+    return ReplyIntent(post_id=match["post_id"], reply_text=match["reply_text"])
+
+def parse_reply_all(match):
+    return ReplyIntent(reply_text=match["reply_text"])
+
+def parse_schedule_generated(match):
+    return ScheduleIntent(delay=float(match["delay"]), subreddit=match["subreddit"].lower(), topic=match["topic"])
+
+def parse_schedule_posts(match):
+    return ScheduleIntent(delay=float(match["delay"]))
+
+def parse_poll(match):
+    return PostIntent(
+        subreddits=match["subreddit"].lower(),
+        post_type="poll",
+        title=match["title"],
+        poll_options=[opt.strip() for opt in match["options"].split(",")],
+        poll_duration=int(match["duration"])
+    )
+
+def parse_post(match):
+    return PostIntent(subreddits=match["subreddit"].lower(), post_type="text", title=match["title"], text=match["text"])
+
+# keyword -> ordered (body grammar, builder) alternatives, plus the error reported when none match
+DISPATCH = {
+    "generate post for": ([(GENERATE_RE, parse_generate)], "Invalid generate post format"),
+    "post generated for": ([(TITLE_TEXT_RE, parse_post_generated)], "Invalid post generated format"),
+    "watch": ([(WATCH_RE, parse_watch)], "Invalid watch format"),
+    "unwatch": ([(UNWATCH_RE, parse_unwatch)], "Invalid unwatch format"),
+    "search for": ([(SEARCH_RE, parse_search)], "Invalid search format"),
+    "reply to post": ([(REPLY_POST_RE, parse_reply_post)], "Invalid reply format"),
+    "reply to all with": ([(REPLY_ALL_RE, parse_reply_all)], "Invalid reply format"),
+    "schedule generated post for": ([(SCHEDULE_GENERATED_RE, parse_schedule_generated)], "Invalid schedule format"),
+    "schedule posts every": ([(SCHEDULE_POSTS_RE, parse_schedule_posts)], "Invalid schedule format"),
+    "post to": ([(POLL_RE, parse_poll), (TITLE_TEXT_RE, parse_post)], "Invalid post format"),
+}
+
+def parse_prompt(prompt):
+    keyword_match = KEYWORD_RE.match(prompt)
+    if not keyword_match:
+        return UnknownIntent(message="Invalid prompt")
+    grammars, error = DISPATCH[keyword_match["keyword"].lower()]
+    start = keyword_match.end()
+    for grammar, build in grammars:
+        match = grammar.fullmatch(prompt, start)
+        if match:
+            return build(match)
+    return UnknownIntent(message=error)
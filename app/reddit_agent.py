@@ -1,26 +1,39 @@
 import praw
 import time
+import heapq
 import json
 import os
 import logging
 from groq import Groq
-from datetime import datetime
+from datetime import datetime, timezone
 from dotenv import load_dotenv
 import re
 import glob
-from threading import Timer
-from app.utils import save_to_excel
+from threading import Timer, Lock, current_thread, local
+from concurrent.futures import ThreadPoolExecutor
+from praw.models import MoreComments
+from app.utils import save_to_excel, append_to_excel
+from app import prompt_parser
 
 load_dotenv()
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
+# Watch loops outlive the per-request RedditAgent, so they are tracked per watch key at module level
+WATCH_TIMERS = {}
+WATCH_TIMERS_LOCK = Lock()
+WATCH_RUN_LOCKS = {}
+
+# PRAW is not thread safe, so each comment-loading worker thread builds its own client
+comment_worker = local()
+
 class RedditAgent:
     def __init__(self):
         self.logs = []
         self.accounts = self.load_accounts()
         self.posts = self.load_posts()
         self.current_account = 0
+        self.active_account = None
         self.current_post = 0
         self.loop_timer = None
         self.reddit = None
@@ -90,15 +103,19 @@ class RedditAgent:
             self.log("No accounts available")
             return
         account = self.accounts[self.current_account]
-        self.reddit = praw.Reddit(
+        self.reddit = self.build_reddit(account)
+        self.active_account = account
+        self.log(f"Switched to account: {account['username']}")
+        self.current_account = (self.current_account + 1) % len(self.accounts)
+
+    def build_reddit(self, account):
+        return praw.Reddit(
             client_id=account["client_id"],
             client_secret=account["client_secret"],
             user_agent=account["user_agent"],
             username=account["username"],
             password=account["password"]
         )
-        self.log(f"Switched to account: {account['username']}")
-        self.current_account = (self.current_account + 1) % len(self.accounts)
 
     def fetch_subreddit_rules(self, subreddit):
         if subreddit in self.subreddit_rules:
@@ -344,30 +361,264 @@ class RedditAgent:
         self.loop_timer.start()
         self.log(f"Next post scheduled in {delay_minutes} minutes")
 
-    def search_reddit(self, topic, subreddits, limit):
-        self.log(f"Searching for '{topic}' in r/{subreddits}")
-        results = []
+    def summarize_submission(self, submission, comment_digest=None):
+        content = f"Summarize: Title: {submission.title}\nBody: {submission.selftext[:1000]}"
+        if comment_digest:
+            content += f"\nTop comments:\n{comment_digest}\nCover the main points of the discussion as well as the post."
+        return self.groq_client.chat.completions.create(
+            model="llama3-70b-8192",
+            messages=[{"role": "user", "content": content}],
+            max_tokens=250 if comment_digest else 150
+        ).choices[0].message.content
+
+    def fetch_comment_digest(self, submission, max_depth=3, more_limit=8, top_n=5, auth_requests=0):
+        start = time.time()
+        submission.comment_sort = "top"
+        # Walk the tree depth-first keeping only a top_n min-heap, so ranking never materializes the flattened thread.
+        # "More" stubs are expanded inline, and only above max_depth and up to more_limit of them (one request each).
+        top = []
+        fetched = ranked = expanded = unexpanded = 0
+        stack = list(submission.comments)
+        while stack:
+            comment = stack.pop()
+            if isinstance(comment, MoreComments):
+                if comment.depth < max_depth and expanded < more_limit:
+                    expanded += 1
+                    stack.extend(comment.comments())
+                else:
+                    unexpanded += 1
+                continue
+            fetched += 1
+            stack.extend(comment.replies)
+            if comment.depth >= max_depth:
+                continue
+            ranked += 1
+            item = (comment.score, comment.id, comment.body)
+            if len(top) < top_n:
+                heapq.heappush(top, item)
+            else:
+                heapq.heappushpop(top, item)
+        digest = "\n".join(f"[{score}] {body[:300]}" for score, _, body in sorted(top, reverse=True))
+        stats = {
+            # One request loads the submission and its comment tree, plus one per expanded stub and any OAuth token fetch
+            "requests": 1 + expanded + auth_requests,
+            "fetched": fetched,
+            "ranked": ranked,
+            "expanded": expanded,
+            "unexpanded": unexpanded,
+            "seconds": round(time.time() - start, 2),
+            "digest_chars": len(digest)
+        }
+        self.log(
+            f"Comments for {submission.id}: {stats['requests']} requests, {fetched} fetched, {ranked} ranked, {expanded} 'more' stubs expanded, "
+            f"{unexpanded} left, {stats['seconds']}s, digest {stats['digest_chars']} chars"
+        )
+        return digest, stats
+
+    def init_comment_worker(self, account):
+        comment_worker.reddit = self.build_reddit(account)
+        comment_worker.token_pending = True
+
+    def load_comment_digest(self, submission_id):
+        try:
+            # A fresh worker client fetches its OAuth token on its first request
+            auth_requests = 1 if comment_worker.token_pending else 0
+            comment_worker.token_pending = False
+            return self.fetch_comment_digest(comment_worker.reddit.submission(id=submission_id), auth_requests=auth_requests)
+        except Exception as e:
+            self.log(f"Error fetching comments for {submission_id}: {str(e)}")
+            return None, None
+
+    def build_search_result(self, submission, digest=None, stats=None):
+        result = {
+            "Title": submission.title,
+            "Subreddit": submission.subreddit.display_name,
+            "URL": submission.url,
+            "Summary": self.summarize_submission(submission, digest),
+            "Post ID": submission.id
+        }
+        if stats:
+            result.update({
+                "Top Comments": digest,
+                "Comment Requests": stats["requests"],
+                "Comments Fetched": stats["fetched"],
+                "Comments Ranked": stats["ranked"],
+                "More Expanded": stats["expanded"],
+                "More Unexpanded": stats["unexpanded"],
+                "Digest Chars": stats["digest_chars"],
+                "Comment Fetch Seconds": stats["seconds"]
+            })
+        return result
+
+    def search_reddit(self, topic, subreddits, limit, with_comments=False):
+        self.log(f"Searching for '{topic}' in r/{subreddits}{' with comments' if with_comments else ''}")
         try:
             subreddit = self.reddit.subreddit(subreddits)
             submissions = list(subreddit.search(query=topic, sort="relevance", time_filter="all", limit=limit))
-            for submission in submissions:
-                summary = self.groq_client.chat.completions.create(
-                    model="llama3-70b-8192",
-                    messages=[{"role": "user", "content": f"Summarize: Title: {submission.title}\nBody: {submission.selftext[:1000]}"}],
-                    max_tokens=150
-                ).choices[0].message.content
+            if not submissions:
+                self.log("Found 0 posts")
+                return []
+            digests = [(None, None)] * len(submissions)
+            workers = min(8, len(submissions))
+            if with_comments:
+                start = time.time()
+                with ThreadPoolExecutor(
+                    max_workers=workers,
+                    initializer=self.init_comment_worker,
+                    initargs=(self.active_account,)
+                ) as executor:
+                    digests = list(executor.map(self.load_comment_digest, [submission.id for submission in submissions]))
+                fetched = sum(stats["fetched"] for _, stats in digests if stats)
+                requests = sum(stats["requests"] for _, stats in digests if stats)
+                self.log(f"Loaded {fetched} comments across {len(submissions)} threads with {requests} requests in {time.time() - start:.2f}s")
+            # Summaries only touch the shared Groq client and attributes already loaded from the search listing,
+            # so they run on their own pool without sharing the PRAW client
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(
+                    self.build_search_result,
+                    submissions,
+                    [digest for digest, _ in digests],
+                    [stats for _, stats in digests]
+                ))
+            self.log(f"Found {len(results)} posts")
+            return results
+        except Exception as e:
+            self.log(f"Search error: {str(e)}")
+            return []
+
+    def watch_key(self, subreddit, topic=None):
+        # Single underscores only come from slugging, so the "__topic_" separator cannot collide with a stream key
+        key = re.sub(r"[^a-z0-9]+", "_", subreddit.lower()).strip("_")
+        if topic:
+            key += "__topic_" + re.sub(r"[^a-z0-9]+", "_", topic.lower()).strip("_")
+        return key
+
+    def load_watch_state(self, key):
+        state_file = os.path.join("watches", f"{key}.json")
+        if not os.path.exists(state_file):
+            return {}
+        try:
+            with open(state_file, "r") as f:
+                return json.load(f)
+        except Exception as e:
+            self.log(f"Error loading watch state {state_file}: {str(e)}")
+            return {}
+
+    def save_watch_state(self, key, state):
+        os.makedirs("watches", exist_ok=True)
+        state_file = os.path.join("watches", f"{key}.json")
+        try:
+            with open(state_file, "w") as f:
+                json.dump(state, f, indent=4)
+        except Exception as e:
+            self.log(f"Error saving watch state {state_file}: {str(e)}")
+
+    def matches_topic(self, submission, topic):
+        text = f"{submission.title} {submission.selftext}"
+        return all(re.search(rf"\b{re.escape(term)}\b", text, re.IGNORECASE) for term in topic.split())
+
+    def watch_subreddit(self, subreddit, topic=None, limit=5):
+        key = self.watch_key(subreddit, topic)
+        # Serialize runs of the same watch so the state file and workbook are never read-modify-written concurrently
+        with WATCH_RUN_LOCKS.setdefault(key, Lock()):
+            return self.run_watch(key, subreddit, topic, limit)
+
+    def run_watch(self, key, subreddit, topic, limit):
+        state = self.load_watch_state(key)
+        last_fullname = state.get("last_fullname")
+        last_created_utc = state.get("last_created_utc", 0)
+        self.log(f"Watching {'new posts' if not topic else repr(topic)} in r/{subreddit} since {last_fullname or 'start'}")
+        results = []
+        try:
+            # The new-post stream drives the high-water mark (search sorted by new lags behind it);
+            # topics are filtered client-side. One page of 100 covers a run unless more posts arrive in between.
+            newest = None
+            new_submissions = []
+            for submission in self.reddit.subreddit(subreddit).new(limit=100):
+                if submission.fullname == last_fullname or submission.created_utc <= last_created_utc:
+                    break
+                newest = newest or submission
+                if topic and not self.matches_topic(submission, topic):
+                    continue
+                new_submissions.append(submission)
+            if not last_fullname:
+                # First run only seeds the mark with the newest `limit` matches
+                new_submissions = new_submissions[:limit]
+            for submission in new_submissions:
+                summary = self.summarize_submission(submission)
                 results.append({
                     "Title": submission.title,
                     "Subreddit": submission.subreddit.display_name,
                     "URL": submission.url,
                     "Summary": summary,
-                    "Post ID": submission.id
+                    "Post ID": submission.id,
+                    "Created": datetime.fromtimestamp(submission.created_utc, timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
                 })
-            self.log(f"Found {len(results)} posts")
-            return results
+            export_file = state.get("export_file", f"reddit_watch_{key}.xlsx")
+            if results:
+                append_to_excel(results[::-1], export_file)
+                state["export_file"] = export_file
+            if newest:
+                state.update({
+                    "subreddit": subreddit,
+                    "topic": topic,
+                    "last_fullname": newest.fullname,
+                    "last_created_utc": newest.created_utc
+                })
+            state["last_run"] = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
+            self.save_watch_state(key, state)
+            self.log(f"Watch r/{subreddit}: {len(results)} new posts, export: {export_file}")
+            return results, state.get("export_file")
         except Exception as e:
-            self.log(f"Search error: {str(e)}")
-            return []
+            self.log(f"Watch error: {str(e)}")
+            return [], state.get("export_file")
+
+    def schedule_watch(self, delay_minutes, subreddit, topic=None):
+        key = self.watch_key(subreddit, topic)
+        # Register the next tick before the first run so an unwatch arriving mid-run cancels it
+        timer = self.make_watch_timer(key, delay_minutes, subreddit, topic)
+        with WATCH_TIMERS_LOCK:
+            previous = WATCH_TIMERS.get(key)
+            WATCH_TIMERS[key] = timer
+        if previous:
+            previous.cancel()
+            self.log(f"Replaced existing watch loop for r/{subreddit}")
+        results, export_file = self.watch_subreddit(subreddit, topic)
+        with WATCH_TIMERS_LOCK:
+            if WATCH_TIMERS.get(key) is timer:
+                timer.start()
+                self.log(f"Next watch run for r/{subreddit} in {delay_minutes} minutes")
+        return results, export_file
+
+    def make_watch_timer(self, key, delay_minutes, subreddit, topic):
+        # A timer that is no longer registered under its key stops on its next tick
+        timer = Timer(delay_minutes * 60, self.run_watch_loop, [key, delay_minutes, subreddit, topic])
+        timer.daemon = True
+        return timer
+
+    def run_watch_loop(self, key, delay_minutes, subreddit, topic):
+        with WATCH_TIMERS_LOCK:
+            if WATCH_TIMERS.get(key) is not current_thread():
+                return
+        self.watch_subreddit(subreddit, topic)
+        with WATCH_TIMERS_LOCK:
+            if WATCH_TIMERS.get(key) is not current_thread():
+                return
+            timer = self.make_watch_timer(key, delay_minutes, subreddit, topic)
+            WATCH_TIMERS[key] = timer
+            timer.start()
+        self.log(f"Next watch run for r/{subreddit} in {delay_minutes} minutes")
+
+    def stop_watch(self, subreddit, topic=None):
+        key = self.watch_key(subreddit, topic)
+        with WATCH_TIMERS_LOCK:
+            timer = WATCH_TIMERS.pop(key, None)
+        if timer:
+            timer.cancel()
+            self.log(f"Stopped watch for {'new posts' if not topic else repr(topic)} in r/{subreddit}")
+            return True
+        self.log(f"No active watch for {'new posts' if not topic else repr(topic)} in r/{subreddit}")
+        return False
 
     def download_search_results(self, results):
         if not results:
@@ -406,8 +657,8 @@ class RedditAgent:
 
     def handle_prompt(self, prompt, search_results=None, url=None, image_path=None, poll_options=None, poll_duration=None):
         parsed = self.parse_prompt(prompt, link=url)
-        if parsed["intent"] == "search":
-            results = self.search_reddit(parsed["topic"], parsed["subreddits"], parsed.get("limit", 5))
+        if parsed.intent == "search":
+            results = self.search_reddit(parsed.topic, parsed.subreddits, parsed.limit, parsed.with_comments)
             download_file = self.download_search_results(results)
             return {
                 "message": "Search results",
@@ -417,6 +668,7 @@ class RedditAgent:
                 "logs": self.logs,
                 "instructions": (
                     "To get more results, use: 'search for <topic> in <subreddit> limit <number>'\n"
+                    "To include comment threads, add 'with comments': 'search for <topic> in <subreddit> limit <number> with comments'\n"
                     "To reply to a post, use: 'reply to post <Post ID> with <text>' or click 'Reply' in the UI\n"
                     "To generate a post, use: 'generate post for <subreddit> about <topic>'\n"
                     "To post a generated post, use: 'post generated for <subreddit> with title <title> text: <text>'\n"
@@ -424,11 +676,34 @@ class RedditAgent:
                     "- Post: 'post to <subreddit> with title <title> text: <text>'\n"
                     "- Poll: 'post to <subreddit> with poll title <title> options <opt1>,<opt2> duration <days>'\n"
                     "- Schedule: 'schedule posts every <minutes> minutes'\n"
-                    "- Schedule generated: 'schedule generated post for <subreddit> about <topic> every <minutes> minutes'"
+                    "- Schedule generated: 'schedule generated post for <subreddit> about <topic> every <minutes> minutes'\n"
+                    "- Watch: 'watch <topic> in <subreddit>' or 'watch <subreddit> every <minutes> minutes' for new posts only\n"
+                    "- Unwatch: 'unwatch <topic> in <subreddit>' or 'unwatch <subreddit>'"
                 )
             }
-        elif parsed["intent"] == "reply":
-            if not parsed.get("post_id") and not search_results:
+        elif parsed.intent == "watch":
+            if parsed.delay:
+                results, export_file = self.schedule_watch(parsed.delay, parsed.subreddit, parsed.topic)
+            else:
+                results, export_file = self.watch_subreddit(parsed.subreddit, parsed.topic)
+            return {
+                "message": f"Found {len(results)} new posts in r/{parsed.subreddit}",
+                "results": results,
+                "post_ids": None,
+                "download_file": export_file,
+                "logs": self.logs
+            }
+        elif parsed.intent == "unwatch":
+            stopped = self.stop_watch(parsed.subreddit, parsed.topic)
+            return {
+                "message": f"Stopped watching r/{parsed.subreddit}" if stopped else f"No active watch for r/{parsed.subreddit}",
+                "results": None,
+                "post_ids": None,
+                "download_file": None,
+                "logs": self.logs
+            }
+        elif parsed.intent == "reply":
+            if not parsed.post_id and not search_results:
                 return {
                     "message": "No search results or post ID provided",
                     "results": None,
@@ -436,8 +711,8 @@ class RedditAgent:
                     "download_file": None,
                     "logs": self.logs
                 }
-            if parsed.get("post_id"):
-                success = self.post_reply(parsed["post_id"], parsed["reply_text"])
+            if parsed.post_id:
+                success = self.post_reply(parsed.post_id, parsed.reply_text)
                 return {
                     "message": "Reply posted" if success else "Reply failed",
                     "results": None,
@@ -445,7 +720,7 @@ class RedditAgent:
                     "download_file": None,
                     "logs": self.logs
                 }
-            successes = sum(self.post_reply(post["Post ID"], parsed["reply_text"]) for post in search_results)
+            successes = sum(self.post_reply(post["Post ID"], parsed.reply_text) for post in search_results)
             return {
                 "message": f"Replied to {successes} posts",
                 "results": None,
@@ -453,26 +728,26 @@ class RedditAgent:
                 "download_file": None,
                 "logs": self.logs
             }
-        elif parsed["intent"] == "generate":
-            title, text = self.generate_post_content(parsed["subreddit"], parsed["topic"])
+        elif parsed.intent == "generate":
+            title, text = self.generate_post_content(parsed.subreddit, parsed.topic)
             return {
                 "message": "Generated post preview",
-                "results": [{"Title": title, "Text": text, "Subreddit": parsed["subreddit"]}],
+                "results": [{"Title": title, "Text": text, "Subreddit": parsed.subreddit}],
                 "post_ids": None,
                 "download_file": None,
                 "logs": self.logs,
                 "instructions": (
                     "Review the generated post above. To post it, use:\n"
-                    f"'post generated for {parsed['subreddit']} with title {title} text: {text}'\n"
+                    f"'post generated for {parsed.subreddit} with title {title} text: {text}'\n"
                     "To edit, modify the title/text and use the post command. To cancel, do nothing."
                 )
             }
-        elif parsed["intent"] == "post_generated":
+        elif parsed.intent == "post_generated":
             post_ids = self.create_post(
-                subreddit=parsed["subreddit"],
+                subreddit=parsed.subreddit,
                 post_type="text",
-                title=parsed["title"],
-                text=parsed["text"]
+                title=parsed.title,
+                text=parsed.text
             )
             return {
                 "message": "Post created" if post_ids else "Post failed",
@@ -481,16 +756,16 @@ class RedditAgent:
                 "download_file": None,
                 "logs": self.logs
             }
-        elif parsed["intent"] == "post":
+        elif parsed.intent == "post":
             post_ids = self.create_post(
-                subreddit=parsed["subreddits"],
-                post_type=parsed["post_type"],
-                title=parsed["title"],
-                text=parsed["text"],
-                url=parsed.get("url") or url,
+                subreddit=parsed.subreddits,
+                post_type=parsed.post_type,
+                title=parsed.title,
+                text=parsed.text,
+                url=parsed.url,
                 image_path=image_path,
-                poll_options=poll_options,
-                poll_duration=poll_duration
+                poll_options=parsed.poll_options or poll_options,
+                poll_duration=parsed.poll_duration or poll_duration
             )
             return {
                 "message": "Post created" if post_ids else "Post failed",
@@ -499,12 +774,12 @@ class RedditAgent:
                 "download_file": None,
                 "logs": self.logs
             }
-        elif parsed["intent"] == "schedule":
-            self.schedule_posts(parsed["delay"], parsed.get("subreddit"), parsed.get("topic"))
+        elif parsed.intent == "schedule":
+            self.schedule_posts(parsed.delay, parsed.subreddit, parsed.topic)
             subreddit_info = ""
-            if parsed.get("subreddit"):
-                subreddit_info = f" for r/{parsed.get('subreddit')} about {parsed.get('topic')}"
-            message = f"Scheduled {'generated ' if parsed.get('subreddit') else ''}posts every {parsed['delay']} minutes{subreddit_info}"
+            if parsed.subreddit:
+                subreddit_info = f" for r/{parsed.subreddit} about {parsed.topic}"
+            message = f"Scheduled {'generated ' if parsed.subreddit else ''}posts every {parsed.delay} minutes{subreddit_info}"
             return {
                 "message": message,
                 "results": None,
@@ -512,6 +787,14 @@ class RedditAgent:
                 "download_file": None,
                 "logs": self.logs
             }
+        elif parsed.intent == "unknown":
+            return {
+                "message": parsed.message,
+                "results": None,
+                "post_ids": None,
+                "download_file": None,
+                "logs": self.logs
+            }
         return {
             "message": "Invalid prompt",
             "results": None,
@@ -521,123 +804,7 @@ class RedditAgent:
         }
 
     def parse_prompt(self, prompt, link=None):
-        prompt_lower = prompt.lower().strip()
-        # Generate post
-        if "generate post for" in prompt_lower:
-            try:
-                parts = prompt_lower.split("generate post for ")[1].strip()
-                subreddit, topic = parts.split(" about ", 1)
-                return {
-                    "intent": "generate",
-                    "subreddit": subreddit.strip(),
-                    "topic": topic.strip()
-                }
-            except:
-                return {"intent": "unknown", "message": "Invalid generate post format"}
-        # Post generated
-        if "post generated for" in prompt_lower:
-            try:
-                parts = prompt_lower.split("post generated for ")[1].strip()
-                subreddit = parts.split(" with title ")[0].strip()
-                title = parts.split("title ")[1].split(" text: ")[0].strip()
-                text = parts.split("text: ")[1].strip()
-                return {
-                    "intent": "post_generated",
-                    "subreddit": subreddit,
-                    "title": title,
-                    "text": text
-                }
-            except:
-                return {"intent": "unknown", "message": "Invalid post generated format"}
-        # Search
-        if "search for" in prompt_lower:
-            try:
-                parts = prompt_lower.split("search for ")[1].strip()
-                topic = parts
-                subreddits = "all"
-                limit = 5
-                if " in " in parts:
-                    topic, rest = parts.split(" in ", 1)
-                    subreddits = rest.strip()
-                    if " limit " in subreddits:
-                        subreddits, limit_part = subreddits.split(" limit ", 1)
-                        limit = int(limit_part.strip())
-                    subreddits = subreddits.strip()
-                topic = topic.strip()
-                return {
-                    "intent": "search",
-                    "topic": topic,
-                    "subreddits": subreddits,
-                    "limit": limit
-                }
-            except Exception as e:
-                return {"intent": "unknown", "message": f"Invalid search format: {str(e)}"}
-        # Reply
-        if "reply to post" in prompt_lower:
-            try:
-                parts = prompt_lower.split("reply to post ")[1].strip()
-                post_id, reply_text = parts.split(" with ", 1)
-                return {
-                    "intent": "reply",
-                    "post_id": post_id.strip(),
-                    "reply_text": reply_text.strip()
-                }
-            except:
-                return {"intent": "unknown", "message": "Invalid reply format"}
-        if "reply to all with" in prompt_lower:
-            reply_text = prompt_lower.split("reply to all with ")[1].strip()
-            return {"intent": "reply", "reply_text": reply_text}
-        # Schedule
-        if "schedule generated post for" in prompt_lower:
-            try:
-                parts = prompt_lower.split("schedule generated post for ")[1].strip()
-                subreddit_topic, delay_part = parts.split(" every ", 1)
-                subreddit, topic = subreddit_topic.split(" about ", 1)
-                delay = float(delay_part.split(" minute")[0].strip())
-                return {
-                    "intent": "schedule",
-                    "subreddit": subreddit.strip(),
-                    "topic": topic.strip(),
-                    "delay": delay
-                }
-            except:
-                return {"intent": "unknown", "message": "Invalid schedule format"}
-        if "schedule posts every" in prompt_lower:
-            try:
-                delay = float(prompt_lower.split("every")[1].split("minute")[0].strip())
-                return {"intent": "schedule", "delay": delay}
-            except:
-                return {"intent": "unknown", "message": "Invalid schedule format"}
-        # Poll
-        if "post to" in prompt_lower and "options" in prompt_lower:
-            try:
-                subreddit = prompt_lower.split("post to ")[1].split(" with ")[0].strip()
-                title = prompt_lower.split("title ")[1].split(" options ")[0].strip()
-                options = prompt_lower.split("options ")[1].split(" duration ")[0].strip().split(",")
-                duration = int(prompt_lower.split("duration ")[1].strip())
-                return {
-                    "intent": "post",
-                    "subreddits": subreddit,
-                    "post_type": "poll",
-                    "title": title,
-                    "poll_options": [opt.strip() for opt in options],
-                    "poll_duration": duration
-                }
-            except:
-                return {"intent": "unknown", "message": "Invalid poll format"}
-        # Post
-        if "post to" in prompt_lower:
-            try:
-                subreddit = prompt_lower.split("post to ")[1].split(" with ")[0].strip()
-                title = prompt_lower.split("title ")[1].split(" text: ")[0].strip()
-                text = prompt_lower.split("text: ")[1].strip()
-                return {
-                    "intent": "post",
-                    "subreddits": subreddit,
-                    "post_type": "text",
-                    "title": title,
-                    "text": text
-                }
-            except:
-                return {"intent": "unknown", "message": "Invalid post format"}
-        return {"intent": "unknown", "message": "Invalid prompt"}
\ No newline at end of file
+        parsed = prompt_parser.parse_prompt(prompt)
+        if parsed.intent == "post" and link and not parsed.url:
+            parsed.url = link
+        return parsed
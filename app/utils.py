@@ -1,8 +1,16 @@
 import pandas as pd
+import os
 from datetime import datetime
 
 def save_to_excel(data, filename_prefix="reddit_results"):
     filename = f"{filename_prefix}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
     df = pd.DataFrame(data)
     df.to_excel(filename, index=False)
+    return filename
+
+def append_to_excel(data, filename):
+    df = pd.DataFrame(data)
+    if os.path.exists(filename):
+        df = pd.concat([pd.read_excel(filename), df], ignore_index=True)
+    df.to_excel(filename, index=False)
     return filename
\ No newline at end of file
@@ -0,0 +1,39 @@
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.prompt_parser import parse_prompt
+
+CORPUS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "prompt_corpus.json")
+
+def check(entry):
+    parsed = parse_prompt(entry["prompt"])
+    errors = []
+    for field, expected in entry["expected"].items():
+        actual = getattr(parsed, field, None)
+        if actual != expected:
+            errors.append(f"{field}: expected {expected!r}, got {actual!r}")
+    return parsed, errors
+
+def main(rounds=20000):
+    with open(CORPUS_FILE, "r") as f:
+        corpus = json.load(f)
+    failures = 0
+    for entry in corpus:
+        parsed, errors = check(entry)
+        print(f"{'FAIL' if errors else 'ok':<5} {parsed.intent:<15} {entry['prompt']}")
+        for error in errors:
+            print(f"      {error}")
+        failures += bool(errors)
+    if failures:
+        raise SystemExit(f"{failures} corpus prompts parsed incorrectly")
+    prompts = [entry["prompt"] for entry in corpus]
+    elapsed = timeit.timeit(lambda: [parse_prompt(prompt) for prompt in prompts], number=rounds)
+    total = rounds * len(prompts)
+    print(f"\nParsed {total} prompts in {elapsed:.3f}s ({total / elapsed:,.0f} prompts/s, {elapsed / total * 1e6:.2f} us/prompt)")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)